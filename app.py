@@ -0,0 +1,425 @@
+"""Gradio web interface for BoltzGen binder design.
+
+Upload a target structure (.pdb/.cif), pick the target chain and optional
+hotspot residues, and launch a small `boltzgen run` job. The uploaded
+structure is shown in an interactive 3Dmol.js preview before the run.
+
+Start with `python app.py` (requires `pip install gradio` on top of the
+regular BoltzGen install).
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import string
+import subprocess
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+WORKSPACE_DIR = Path("gradio_workspace")
+
+PROTOCOLS = [
+    "protein-anything",
+    "peptide-anything",
+    "protein-small_molecule",
+    "antibody-anything",
+    "nanobody-anything",
+]
+
+# Escape table for placing the viewer HTML inside the double-quoted srcdoc
+# attribute. Only '"' can terminate the attribute and only '&' starts an
+# entity there ('<' is inert until the inner document is parsed, and the
+# JS literal already defuses </script>), so a two-char translate pass does
+# the job of html.escape's five chained str.replace passes over the
+# largest string in the pipeline.
+_SRCDOC_ESCAPE = str.maketrans({"&": "&amp;", '"': "&quot;"})
+
+# Rendered iframes keyed by file identity: (path, size, mtime_ns) for
+# paths, (size, sha1 of the first 64KB) for in-memory uploads. Re-uploads
+# of the same file then skip the whole escape pipeline.
+_IFRAME_CACHE: dict[tuple, str] = {}
+_IFRAME_CACHE_MAX = 32
+
+# Above this size the structure is staged as a workspace file the iframe
+# fetches over HTTP (gzipped, browser-cached) instead of being embedded in
+# the srcdoc attribute, which keeps the outer HTML payload constant-size.
+_INLINE_PREVIEW_MAX = 512 * 1024
+
+# Deletes any whitespace from the hotspot list in one pass.
+_WS_STRIP = str.maketrans("", "", " \t\n\r")
+
+_PREVIEW_DIR = WORKSPACE_DIR / "previews"
+
+# Viewer page, parsed once at import. Rendered with safe_substitute so the
+# literal `$3Dmol` global is passed through untouched; only $fmt and
+# $load_js are placeholders.
+_VIEWER_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+<script src="https://3Dmol.org/build/3Dmol-min.js"></script>
+<style>html, body { margin: 0; height: 100%; }</style>
+</head>
+<body>
+<div id="viewer" style="width: 100%; height: 100%; position: relative;"></div>
+<script>
+let element = document.getElementById('viewer');
+let viewer = $3Dmol.createViewer(element,
+    {backgroundColor: 'white', antialias: false, lowQuality: true});
+function renderStructure(pdbData) {
+viewer.addModel(pdbData, '$fmt');
+let numAtoms = viewer.getModel().selectedAtoms({}).length;
+if (numAtoms > 20000) {
+    // Ribosome-sized inputs: cartoon only, no sticks, no hover labels.
+    viewer.setStyle({}, {cartoon: {color: 'spectrum', quality: 1}});
+} else {
+    viewer.setStyle({}, {cartoon: {color: 'spectrum'}, stick: {radius: 0.15}});
+    // Hover on C-alpha only (one callback per residue rather than per
+    // atom), with a trailing 50ms debounce so rapid cursor motion does
+    // not thrash label creation.
+    let hoverTimer = null;
+    viewer.setHoverable({atom: 'CA'}, true,
+        function(atom, viewer, event, container) {
+            if (hoverTimer) clearTimeout(hoverTimer);
+            hoverTimer = setTimeout(function() {
+                if (!atom.label) {
+                    atom.label = viewer.addLabel(
+                        atom.resn + ' ' + atom.resi + ' (' + atom.chain + ')',
+                        {position: atom, backgroundColor: 'mintcream', fontColor: 'black'});
+                }
+            }, 50);
+        },
+        function(atom, viewer) {
+            if (hoverTimer) { clearTimeout(hoverTimer); hoverTimer = null; }
+            if (atom.label) {
+                viewer.removeLabel(atom.label);
+                delete atom.label;
+            }
+        });
+}
+viewer.zoomTo();
+viewer.render();
+}
+$load_js
+</script>
+</body>
+</html>""")
+
+
+def _read_structure_bytes(path: Path) -> bytes:
+    """Read a structure file through mmap, leaning on the OS page cache.
+
+    Repeated previews of the same file then come straight from cached
+    pages instead of a fresh read. mmap rejects empty files, so those
+    fall back to a plain read.
+    """
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return bytes(mm)
+        except ValueError:
+            return path.read_bytes()
+
+
+def _structure_format(raw: bytes) -> str:
+    """Distinguish mmCIF from PDB by content (binary uploads carry no name)."""
+    return "cif" if raw.lstrip()[:5] == b"data_" else "pdb"
+
+
+def _preview_file_url(raw: bytes, fmt: str) -> str:
+    """Stage a structure under the workspace and return its Gradio file URL.
+
+    Files are named by content hash, so re-uploads reuse the staged copy.
+    """
+    digest = hashlib.sha1(raw).hexdigest()
+    _PREVIEW_DIR.mkdir(parents=True, exist_ok=True)
+    path = _PREVIEW_DIR / f"{digest}.{fmt}"
+    if not path.exists():
+        path.write_bytes(raw)
+    return f"/file={path.resolve()}"
+
+
+def get_interactive_3dmol_iframe(pdb_source: Union[bytes, str]) -> str:
+    """Build a self-contained 3Dmol.js viewer iframe for a structure.
+
+    Parameters
+    ----------
+    pdb_source : bytes or str
+        Raw .pdb/.cif file content, or a path to such a file.
+
+    Returns
+    -------
+    str
+        An `<iframe srcdoc=...>` snippet suitable for a gr.HTML component.
+    """
+    if isinstance(pdb_source, bytes):
+        cache_key: tuple = (
+            len(pdb_source),
+            hashlib.sha1(pdb_source[:65536]).hexdigest(),
+        )
+    else:
+        st = Path(pdb_source).stat()
+        cache_key = (pdb_source, st.st_size, st.st_mtime_ns)
+    cached = _IFRAME_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    raw = (
+        pdb_source
+        if isinstance(pdb_source, bytes)
+        else _read_structure_bytes(Path(pdb_source))
+    )
+    fmt = _structure_format(raw)
+    if len(raw) > _INLINE_PREVIEW_MAX:
+        # Large structure: keep the srcdoc constant-size and let the
+        # iframe fetch the coordinates from the staged workspace file.
+        load_js = (
+            f"fetch('{_preview_file_url(raw, fmt)}')"
+            ".then(r => r.text()).then(renderStructure);"
+        )
+    else:
+        # Small structure: embed inline and skip the HTTP round trip.
+        # PDB/mmCIF are ASCII, so the explicit decode is a plain
+        # memcpy+validate. json.dumps then emits a complete quoted JS
+        # string literal in one C-level pass and covers everything the
+        # hand-rolled escape missed (NULs, double quotes, U+2028). The
+        # extra replace defuses a literal </script> inside the data,
+        # which JSON leaves alone.
+        pdb_js_literal = json.dumps(
+            raw.decode("ascii", errors="replace")
+        ).replace("</", "<\\/")
+        load_js = f"renderStructure({pdb_js_literal});"
+    inner_html = _VIEWER_TEMPLATE.safe_substitute(fmt=fmt, load_js=load_js)
+    iframe_html = (
+        f'<iframe srcdoc="{inner_html.translate(_SRCDOC_ESCAPE)}" width="100%" '
+        'height="600px" style="border: none;"></iframe>'
+    )
+    if len(_IFRAME_CACHE) >= _IFRAME_CACHE_MAX:
+        _IFRAME_CACHE.pop(next(iter(_IFRAME_CACHE)))
+    _IFRAME_CACHE[cache_key] = iframe_html
+    return iframe_html
+
+
+def generate_config_yaml(
+    job_dir: Path,
+    pdb_name: str,
+    target_chain_id: str,
+    hotspots: str,
+    binder_len_min: int,
+    binder_len_max: int,
+    is_cyclic: bool,
+) -> Path:
+    """Write a design specification .yaml into `job_dir` and return its path.
+
+    The spec shape is fixed and tiny, so it is emitted directly instead of
+    going through PyYAML's representer machinery.
+    """
+    lines = [
+        "entities:",
+        "- protein:",
+        "    id: B",
+        f"    sequence: {binder_len_min}..{binder_len_max}",
+    ]
+    if is_cyclic:
+        lines.append("    cyclic: true")
+    lines += [
+        "- file:",
+        f"    path: {pdb_name}",
+        "    include:",
+        "    - chain:",
+        f"        id: {target_chain_id}",
+    ]
+    if hotspots:
+        lines += [
+            "    binding_types:",
+            "    - chain:",
+            f"        id: {target_chain_id}",
+            f"        binding: {hotspots}",
+        ]
+    yaml_path = job_dir / "design_spec.yaml"
+    yaml_path.write_text("\n".join(lines) + "\n")
+    return yaml_path
+
+
+def run_boltzgen_task(
+    pdb_bytes: Optional[bytes],
+    target_chain_id: str,
+    hotspots_text: str,
+    binder_len_min: int,
+    binder_len_max: int,
+    is_cyclic: bool,
+    num_designs: int,
+    budget: int,
+    protocol: str,
+) -> Iterator[tuple[Optional[str], str]]:
+    """Run a full `boltzgen run` job, yielding (top design path, logs).
+
+    Implemented as a generator so Gradio can stream the log output while
+    the pipeline is running instead of freezing until it exits.
+    """
+    if pdb_bytes is None:
+        yield None, "Please upload a target structure first."
+        return
+
+    job_dir = WORKSPACE_DIR / f"job_{uuid.uuid4().hex[:8]}"
+    job_dir.mkdir(parents=True, exist_ok=True)
+    # Binary uploads never touch a Gradio temp file; this is the only
+    # write of the structure to disk.
+    saved_pdb_path = job_dir / f"input.{_structure_format(pdb_bytes)}"
+    saved_pdb_path.write_bytes(pdb_bytes)
+
+    # Reuse the input untouched when it is already clean.
+    clean_hotspots = (
+        hotspots_text.translate(_WS_STRIP)
+        if any(c in hotspots_text for c in " \t\n\r")
+        else hotspots_text
+    )
+    config_path = generate_config_yaml(
+        job_dir=job_dir,
+        pdb_name=saved_pdb_path.name,
+        target_chain_id=target_chain_id.strip(),
+        hotspots=clean_hotspots,
+        binder_len_min=int(binder_len_min),
+        binder_len_max=int(binder_len_max),
+        is_cyclic=is_cyclic,
+    )
+
+    output_dir = job_dir / "output"
+    cmd = [
+        "boltzgen",
+        "run",
+        str(config_path),
+        "--output",
+        str(output_dir),
+        "--protocol",
+        protocol,
+        "--num_designs",
+        str(int(num_designs)),
+        "--budget",
+        str(int(budget)),
+    ]
+    # Stream the pipeline output line by line; the deque keeps memory
+    # bounded for long runs while still showing the most recent activity.
+    proc = subprocess.Popen(
+        cmd,
+        cwd=job_dir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    log_lines: deque[str] = deque(maxlen=2000)
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        log_lines.append(line.rstrip("\n"))
+        yield None, "\n".join(log_lines)
+    proc.wait()
+    log = "\n".join(log_lines)
+
+    final_dir = (
+        output_dir / "final_ranked_designs" / f"final_{int(budget)}_designs"
+    )
+    if not final_dir.is_dir():
+        yield None, log + "\n\nNo final designs were produced."
+        return
+    # One scandir pass picks up both extensions; each glob would walk the
+    # directory again with regex matching per entry.
+    with os.scandir(final_dir) as it:
+        generated_files = sorted(
+            Path(entry.path)
+            for entry in it
+            if entry.is_file() and entry.name.endswith((".pdb", ".cif"))
+        )
+    if not generated_files:
+        yield None, log + "\n\nNo final designs were produced."
+        return
+    # Each design is independent I/O, so fan the per-design work out;
+    # today that is just a stat for the summary, and heavier per-design
+    # metrics can drop into the same map.
+    with ThreadPoolExecutor() as ex:
+        sizes = list(ex.map(lambda p: p.stat().st_size, generated_files))
+    summary = "\n".join(
+        f"  {path.name} ({size / 1024:.0f} KB)"
+        for path, size in zip(generated_files, sizes)
+    )
+    yield str(generated_files[0]), log + "\n\nFinal designs:\n" + summary
+
+
+def build_demo():
+    """Construct the Gradio UI.
+
+    gradio is imported here rather than at module scope so the helpers
+    above stay importable (e.g. for tests or scripting) without paying
+    its multi-second import.
+    """
+    import gradio as gr
+
+    with gr.Blocks(title="BoltzGen") as demo:
+        gr.Markdown("# BoltzGen binder design")
+        with gr.Row():
+            with gr.Column():
+                pdb_input = gr.File(
+                    label="Target structure (.pdb / .cif)",
+                    file_types=[".pdb", ".cif"],
+                    type="binary",
+                )
+                target_chain = gr.Textbox(label="Target Chain", value="A")
+                hotspots = gr.Textbox(
+                    label="Hotspots (residue numbers, e.g. 343,344,251)"
+                )
+                with gr.Row():
+                    binder_len_min = gr.Number(
+                        label="Min binder length", value=80, precision=0
+                    )
+                    binder_len_max = gr.Number(
+                        label="Max binder length", value=140, precision=0
+                    )
+                is_cyclic = gr.Checkbox(label="Cyclic binder")
+                num_designs = gr.Number(
+                    label="Number of designs", value=10, precision=0
+                )
+                budget = gr.Number(
+                    label="Budget (final set size)", value=2, precision=0
+                )
+                protocol = gr.Dropdown(
+                    choices=PROTOCOLS, value="protein-anything", label="Protocol"
+                )
+                run_btn = gr.Button("Run BoltzGen", variant="primary")
+            with gr.Column():
+                viewer = gr.HTML(label="Preview")
+                output_file = gr.File(label="Top design")
+                logs = gr.Textbox(label="Logs", lines=20)
+
+        # always_last collapses the burst of .change events Gradio can
+        # fire while an upload finalises into a single trailing run.
+        pdb_input.change(
+            lambda x: get_interactive_3dmol_iframe(x) if x else "",
+            inputs=pdb_input,
+            outputs=viewer,
+            trigger_mode="always_last",
+        )
+        run_btn.click(
+            run_boltzgen_task,
+            inputs=[
+                pdb_input,
+                target_chain,
+                hotspots,
+                binder_len_min,
+                binder_len_max,
+                is_cyclic,
+                num_designs,
+                budget,
+                protocol,
+            ],
+            outputs=[output_file, logs],
+        )
+    return demo
+
+
+if __name__ == "__main__":
+    WORKSPACE_DIR.mkdir(exist_ok=True)
+    # allowed_paths lets the iframe fetch staged preview files via /file=.
+    build_demo().launch(allowed_paths=[str(WORKSPACE_DIR.resolve())])